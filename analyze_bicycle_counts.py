@@ -18,18 +18,22 @@ def load_and_process_data(csv_path):
     df = pd.read_csv(csv_path)
     print(f"Loaded {len(df):,} records")
     
-    # Convert date column to datetime
-    df['date'] = pd.to_datetime(df['date'])
+    # Per-interval counts are small non-negative integers
+    df['counts'] = pd.to_numeric(df['counts'], downcast='unsigned')
     
-    # Extract just the date (no time) for daily aggregation
-    df['date_only'] = df['date'].dt.date
+    # Convert date column to datetime (timestamps repeat across counters, so cache them)
+    df['date'] = pd.to_datetime(df['date'], cache=True)
     
-    # Group by date and sum the counts
-    daily_counts = df.groupby('date_only')['counts'].sum().reset_index()
-    daily_counts['date_only'] = pd.to_datetime(daily_counts['date_only'])
+    # Truncate to the day for daily aggregation, staying in datetime64
+    df['date_only'] = df['date'].dt.floor('D')
     
-    # Sort by date
-    daily_counts = daily_counts.sort_values('date_only')
+    # Sum the counts per day with a single bincount over sorted day codes
+    # (sort=True returns the days ascending, so no separate sort is needed)
+    day_codes, days = pd.factorize(df['date_only'], sort=True)
+    valid = day_codes >= 0  # factorize marks missing dates with -1
+    daily_totals = np.bincount(day_codes[valid], weights=df['counts'].fillna(0).to_numpy(dtype=np.float64)[valid],
+                               minlength=len(days))
+    daily_counts = pd.DataFrame({'date_only': days, 'counts': daily_totals.astype(np.int32)})
     
     print(f"Aggregated to {len(daily_counts)} days of data")
     print(f"Date range: {daily_counts['date_only'].min().strftime('%Y-%m-%d')} to {daily_counts['date_only'].max().strftime('%Y-%m-%d')}")
@@ -39,9 +43,9 @@ def load_and_process_data(csv_path):
 def create_ridership_chart(daily_counts):
     """Create a comprehensive ridership visualization."""
     
-    # Calculate 7-day and 30-day moving averages
-    daily_counts['ma_7'] = daily_counts['counts'].rolling(window=7, center=True).mean()
-    daily_counts['ma_30'] = daily_counts['counts'].rolling(window=30, center=True).mean()
+    # Calculate 7-day and 30-day moving averages (partial windows at the series edges)
+    daily_counts['ma_7'] = daily_counts['counts'].rolling(window=7, center=True, min_periods=1).mean().astype('float32')
+    daily_counts['ma_30'] = daily_counts['counts'].rolling(window=30, center=True, min_periods=1).mean().astype('float32')
     
     # Create the visualization
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
@@ -15,58 +15,113 @@ import os
 import sys
 from datetime import datetime
 
-def load_and_preprocess_data(filename: str) -> pd.DataFrame:
-    """Load CSV data and filter for pedestrian casualties involving bikes."""
-    print("Loading collision data...")
+def normalize_vehicle_categories(col: pd.Series) -> pd.Series:
+    """Strip and upper-case a categorical vehicle column once per category, not per row."""
+    normalized = col.cat.categories.astype(str).str.strip().str.upper()
     
-    # Check if file exists
-    if not os.path.exists(filename):
-        print(f"Error: File '{filename}' not found.")
-        sys.exit(1)
+    # Categories that only differed by case or padding collapse into one
+    categories, remap = np.unique(normalized, return_inverse=True)
+    
+    # Missing values keep code -1, which indexes the appended sentinel
+    codes = np.append(remap, -1)[col.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories), index=col.index, name=col.name)
+
+def parse_collision_csv(filename: str) -> pd.DataFrame:
+    """Parse the needed columns from the raw collisions CSV, reading blank or non-numeric casualty counts as 0."""
+    # Vehicle type columns
+    vehicle_cols = ['VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3',
+                   'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
+    
+    # Check required columns exist (header only, before parsing any rows)
+    required_columns = ['CRASH DATE', 'NUMBER OF PEDESTRIANS INJURED', 'NUMBER OF PEDESTRIANS KILLED'] + vehicle_cols
     
     try:
-        df = pd.read_csv(filename, low_memory=False)
+        header = pd.read_csv(filename, nrows=0)
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         sys.exit(1)
     
-    # Check required columns exist
-    required_columns = ['CRASH DATE', 'NUMBER OF PEDESTRIANS INJURED', 'NUMBER OF PEDESTRIANS KILLED',
-                       'VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3',
-                       'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
-    
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in required_columns if col not in header.columns]
     if missing_columns:
         print(f"Error: Missing required columns: {missing_columns}")
         sys.exit(1)
     
-    # Parse dates and extract year
+    # Parse only the required columns with the multithreaded PyArrow reader,
+    # dictionary-encoding the ~100 distinct vehicle type strings
     try:
-        df['CRASH DATE'] = pd.to_datetime(df['CRASH DATE'], errors='coerce')
-        df['YEAR'] = df['CRASH DATE'].dt.year
+        df = pd.read_csv(filename, engine='pyarrow', usecols=required_columns,
+                         dtype={col: 'category' for col in vehicle_cols})
+    except Exception as e:
+        print(f"Error reading CSV file: {e}")
+        sys.exit(1)
+    
+    # Safe conversion of casualty numbers to narrow integers, once per column;
+    # unlike the old per-row loop, a blank count becomes 0 instead of skipping the collision
+    for col in ['NUMBER OF PEDESTRIANS INJURED', 'NUMBER OF PEDESTRIANS KILLED']:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('int16')
+    
+    # Parse dates using the fixed MM/DD/YYYY export format
+    try:
+        raw_dates = df['CRASH DATE']
+        crash_dates = pd.to_datetime(raw_dates, format='%m/%d/%Y', errors='coerce', cache=True)
+        
+        # Fall back to per-value parsing only for rows not in the expected format
+        unparsed = crash_dates.isna() & raw_dates.notna()
+        if unparsed.any():
+            crash_dates[unparsed] = pd.to_datetime(raw_dates[unparsed], format='mixed', errors='coerce')
+        df['CRASH DATE'] = crash_dates
     except Exception as e:
         print(f"Error parsing dates: {e}")
         sys.exit(1)
     
+    return df
+
+def load_and_preprocess_data(filename: str) -> pd.DataFrame:
+    """Load CSV data and filter for pedestrian casualties involving bikes."""
+    print("Loading collision data...")
+    
+    # Check if file exists
+    if not os.path.exists(filename):
+        print(f"Error: File '{filename}' not found.")
+        sys.exit(1)
+    
+    # Reuse the parsed columns from a previous run unless the CSV is newer
+    cache_file = os.path.splitext(filename)[0] + '.bike_vs_ebike.parquet'
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) > os.path.getmtime(filename):
+        print(f"Using cached columns from '{cache_file}'")
+        df = pd.read_parquet(cache_file)
+    else:
+        df = parse_collision_csv(filename)
+        try:
+            df.to_parquet(cache_file, compression='zstd')
+        except Exception as e:
+            print(f"Warning: Could not write cache file '{cache_file}': {e}")
+    
+    # Vehicle type columns
+    vehicle_cols = ['VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3',
+                   'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
+    
     # Filter for valid dates and pedestrian casualties
-    df = df[df['YEAR'].notna()].copy()
+    df = df[df['CRASH DATE'].notna()].copy()
+    # Counts are non-negative, so a single compare on the bitwise OR finds any casualty
     pedestrian_collisions = df[
-        (df['NUMBER OF PEDESTRIANS INJURED'] > 0) | 
-        (df['NUMBER OF PEDESTRIANS KILLED'] > 0)
+        (df['NUMBER OF PEDESTRIANS INJURED'] | df['NUMBER OF PEDESTRIANS KILLED']) > 0
     ].copy()
     
     # Filter for bike-involved collisions
-    vehicle_cols = ['VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3',
-                   'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
-    
-    bike_types = ['Bike', 'BIKE', 'E-Bike', 'E-BIKE', 'E-Scooter', 'E-SCOOTER']
+    bike_types = ['BIKE', 'E-BIKE', 'E-SCOOTER']
     
-    bike_mask = False
+    # Normalize vehicle names once so the filter and extraction only see canonical case
     for col in vehicle_cols:
-        bike_mask |= pedestrian_collisions[col].isin(bike_types)
+        pedestrian_collisions[col] = normalize_vehicle_categories(pedestrian_collisions[col])
+    
+    bike_mask = pedestrian_collisions[vehicle_cols].isin(bike_types).any(axis=1)
     
     bike_collisions = pedestrian_collisions[bike_mask].copy()
     
+    # Extract year only for the surviving bike collisions
+    bike_collisions['YEAR'] = bike_collisions['CRASH DATE'].dt.year.astype('int16')
+    
     print(f"Total collision records: {len(df):,}")
     print(f"Collisions with pedestrian casualties: {len(pedestrian_collisions):,}")
     print(f"Bike-involved pedestrian casualties: {len(bike_collisions):,}")
@@ -76,9 +131,6 @@ def load_and_preprocess_data(filename: str) -> pd.DataFrame:
 
 def extract_bike_data_by_year(df: pd.DataFrame) -> Dict[str, Dict[int, Dict[str, float]]]:
     """Extract yearly casualty data by specific bike type."""
-    # Structure: {bike_type: {year: {injured: count, killed: count}}}
-    yearly_data = defaultdict(lambda: defaultdict(lambda: {'injured': 0, 'killed': 0}))
-    
     # Calculate 2025 projection factor
     latest_date = df['CRASH DATE'].max()
     days_in_2025 = (latest_date - pd.Timestamp("2025-01-01")).days + 1
@@ -88,56 +140,52 @@ def extract_bike_data_by_year(df: pd.DataFrame) -> Dict[str, Dict[int, Dict[str,
     vehicle_cols = ['VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3', 
                    'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
     
-    # Bike type mapping
+    # Bike type mapping (vehicle names are upper-cased in load_and_preprocess_data)
     bike_mapping = {
-        'Bike': 'Traditional Bicycle',
         'BIKE': 'Traditional Bicycle',
-        'E-Bike': 'E-Bike',
         'E-BIKE': 'E-Bike',
-        'E-Scooter': 'E-Scooter',
         'E-SCOOTER': 'E-Scooter'
     }
     
-    for _, row in df.iterrows():
-        # Safe conversion of casualty numbers and year
-        try:
-            injured = int(pd.to_numeric(row['NUMBER OF PEDESTRIANS INJURED'], errors='coerce') or 0)
-            killed = int(pd.to_numeric(row['NUMBER OF PEDESTRIANS KILLED'], errors='coerce') or 0)
-            year = int(row['YEAR'])
-        except (ValueError, TypeError):
-            continue
-        
-        # Only process data from 2020 onwards for better data quality
-        if year < 2020:
-            continue
-            
-        # Apply projection factor for 2025 data
-        if year == 2025:
-            injured *= projection_factor
-            killed *= projection_factor
-        
-        # Get all bike types involved in this collision
-        bikes_in_collision = []
-        for col in vehicle_cols:
-            vehicle = row[col]
-            if pd.notna(vehicle) and str(vehicle).strip() in bike_mapping:
-                bike_type = bike_mapping[str(vehicle).strip()]
-                bikes_in_collision.append(bike_type)
-        
-        # If no valid bike types found, skip this collision
-        if not bikes_in_collision:
-            continue
-            
-        # Remove duplicates while preserving order
-        unique_bikes = list(dict.fromkeys(bikes_in_collision))
-        
-        # Distribute casualties among unique bike types in collision
-        casualty_per_bike_injured = injured / len(unique_bikes)
-        casualty_per_bike_killed = killed / len(unique_bikes)
-        
-        for bike_type in unique_bikes:
-            yearly_data[bike_type][year]['injured'] += casualty_per_bike_injured
-            yearly_data[bike_type][year]['killed'] += casualty_per_bike_killed
+    # Map each vehicle column to bike types (once per category, then a code lookup)
+    collisions = pd.DataFrame({col: df[col].map(bike_mapping) for col in vehicle_cols})
+    
+    # Apply projection factor for 2025 data as one branchless per-row scale
+    years = df['YEAR'].to_numpy()
+    scale = np.where(years == 2025, projection_factor, 1.0)
+    
+    # Casualty counts are already numeric from load_and_preprocess_data
+    collisions['YEAR'] = years
+    collisions['injured'] = df['NUMBER OF PEDESTRIANS INJURED'].to_numpy(dtype=np.float64) * scale
+    collisions['killed'] = df['NUMBER OF PEDESTRIANS KILLED'].to_numpy(dtype=np.float64) * scale
+    
+    # Only process data from 2020 onwards for better data quality
+    collisions = collisions[collisions['YEAR'] >= 2020]
+    
+    # One row per vehicle slot, keyed by collision
+    collisions = collisions.reset_index(drop=True).rename_axis('cid').reset_index()
+    vehicles = collisions.melt(id_vars=['cid', 'YEAR', 'injured', 'killed'],
+                               value_vars=vehicle_cols, value_name='bike_type')
+    
+    # Get all bike types involved in each collision, dropping non-bike vehicles; back in collision
+    # order so bike types keep the order in which they first appear
+    vehicles = vehicles.dropna(subset=['bike_type']).sort_values('cid', kind='stable')
+    vehicles['bike_type'] = vehicles['bike_type'].astype('category')
+    
+    # Remove duplicate bike types within a collision (hashes small integer codes)
+    vehicles = vehicles.drop_duplicates(['cid', 'bike_type'])
+    
+    # Distribute casualties among unique bike types in collision
+    bikes_per_collision = vehicles.groupby('cid')['bike_type'].transform('size')
+    vehicles['injured'] = vehicles['injured'] / bikes_per_collision
+    vehicles['killed'] = vehicles['killed'] / bikes_per_collision
+    
+    totals = vehicles.groupby(['bike_type', 'YEAR'], observed=True, sort=False)[['injured', 'killed']].sum()
+    
+    # Structure: {bike_type: {year: {injured: count, killed: count}}}
+    yearly_data = defaultdict(dict)
+    for (bike_type, year), casualties in totals.to_dict('index').items():
+        yearly_data[bike_type][int(year)] = casualties
     
     return dict(yearly_data)
 
@@ -204,11 +252,22 @@ def create_bike_comparison_charts(yearly_data: Dict[str, Dict[int, Dict[str, flo
 def generate_bike_analysis_data(yearly_data: Dict[str, Dict[int, Dict[str, float]]]) -> Dict[str, Any]:
     """Generate analysis data for markdown report."""
     
+    # Flatten to one row per (bike type, year) for vectorized aggregation
+    tidy = pd.DataFrame(
+        [(bike_type, year, data['injured'], data['killed'])
+         for bike_type, year_data in yearly_data.items() for year, data in year_data.items()],
+        columns=['bike_type', 'year', 'injured', 'killed']
+    )
+    
+    # Pivot once to year x bike type; every total below is derived from it
+    pivot = tidy.pivot_table(index='year', columns='bike_type', values=['injured', 'killed'],
+                             aggfunc='sum', fill_value=0)
+    injured = pivot['injured']
+    killed = pivot['killed']
+    totals = injured + killed
+    
     # Get all years
-    all_years = set()
-    for bike_data in yearly_data.values():
-        all_years.update(bike_data.keys())
-    all_years = sorted(list(all_years))
+    all_years = list(pivot.index)
     
     analysis = {
         'years_covered': f"{min(all_years):.0f}-{max(all_years):.0f}",
@@ -217,25 +276,29 @@ def generate_bike_analysis_data(yearly_data: Dict[str, Dict[int, Dict[str, float
         'key_insights': []
     }
     
-    # Calculate totals and trends for each bike type
+    # Calculate totals for each bike type
+    injured_by_type = injured.sum()
+    killed_by_type = killed.sum()
+    
+    # Find first and last years with data
+    has_data = totals.gt(0)
+    first_years = has_data.idxmax()
+    last_years = has_data.iloc[::-1].idxmax()
+    
     for bike_type, year_data in yearly_data.items():
-        total_injured = sum(data['injured'] for data in year_data.values())
-        total_killed = sum(data['killed'] for data in year_data.values())
+        total_injured = injured_by_type[bike_type]
+        total_killed = killed_by_type[bike_type]
         total_casualties = total_injured + total_killed
         fatality_rate = (total_killed / total_casualties * 100) if total_casualties > 0 else 0
         
-        # Find first and last years with data
-        years_with_data = [year for year, data in year_data.items() 
-                          if data['injured'] + data['killed'] > 0]
-        
-        first_year = min(years_with_data) if years_with_data else None
-        last_year = max(years_with_data) if years_with_data else None
+        first_year = int(first_years[bike_type]) if has_data[bike_type].any() else None
+        last_year = int(last_years[bike_type]) if has_data[bike_type].any() else None
         
         # Calculate growth if possible
         growth_rate = None
         if first_year and last_year and first_year != last_year:
-            first_total = year_data[first_year]['injured'] + year_data[first_year]['killed']
-            last_total = year_data[last_year]['injured'] + year_data[last_year]['killed']
+            first_total = totals.at[first_year, bike_type]
+            last_total = totals.at[last_year, bike_type]
             if first_total > 0:
                 growth_rate = ((last_total - first_total) / first_total) * 100
         
@@ -251,15 +314,13 @@ def generate_bike_analysis_data(yearly_data: Dict[str, Dict[int, Dict[str, float
         }
     
     # Calculate yearly totals across all bike types
+    year_injured = injured.sum(axis=1)
+    year_killed = killed.sum(axis=1)
     for year in all_years:
-        year_injured = sum(yearly_data[bt].get(year, {'injured': 0})['injured'] 
-                          for bt in yearly_data.keys())
-        year_killed = sum(yearly_data[bt].get(year, {'killed': 0})['killed'] 
-                         for bt in yearly_data.keys())
-        analysis['yearly_totals'][year] = {
-            'injured': year_injured,
-            'killed': year_killed,
-            'total': year_injured + year_killed
+        analysis['yearly_totals'][int(year)] = {
+            'injured': year_injured[year],
+            'killed': year_killed[year],
+            'total': year_injured[year] + year_killed[year]
         }
     
     # Generate key insights
@@ -9,7 +9,6 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-from collections import defaultdict
 from typing import Dict, List, Any, Tuple
 import os
 import sys
@@ -81,43 +80,30 @@ def calculate_casualty_rates():
     """Calculate casualty rates per million rides."""
     bike_casualties = get_bike_casualty_data_by_year()
     
-    # Calculate total bike casualties per year (all bike types combined)
-    yearly_totals = defaultdict(lambda: {'injured': 0, 'killed': 0, 'total': 0})
+    # Flatten to one row per (bike type, year)
+    tidy = pd.DataFrame(
+        [(bike_type, year, casualties['injured'], casualties['killed'])
+         for bike_type, year_data in bike_casualties.items() for year, casualties in year_data.items()],
+        columns=['bike_type', 'year', 'injured', 'killed']
+    )
     
-    for bike_type, year_data in bike_casualties.items():
-        for year, casualties in year_data.items():
-            yearly_totals[year]['injured'] += casualties['injured']
-            yearly_totals[year]['killed'] += casualties['killed']
-            yearly_totals[year]['total'] += casualties['injured'] + casualties['killed']
+    # Calculate total bike casualties per year (all bike types combined)
+    yearly = tidy.groupby('year')[['injured', 'killed']].sum()
+    yearly['casualties'] = yearly['injured'] + yearly['killed']
     
-    # Calculate rates per million rides
-    casualty_rates = []
+    # Keep years that have both casualty and ridership data
+    rates = yearly.join(pd.Series(RIDERSHIP_DATA, name='rides'), how='inner').sort_index()
+    rates = rates[rates['rides'] > 0]
     
-    for year in sorted(RIDERSHIP_DATA.keys()):
-        if year in yearly_totals and RIDERSHIP_DATA[year] > 0:
-            rides = RIDERSHIP_DATA[year]
-            casualties = yearly_totals[year]['total']
-            injured = yearly_totals[year]['injured']
-            killed = yearly_totals[year]['killed']
-            
-            # Rate per million rides
-            casualty_rate = (casualties / rides) * 1000000
-            injury_rate = (injured / rides) * 1000000
-            fatality_rate = (killed / rides) * 1000000
-            
-            casualty_rates.append({
-                'year': year,
-                'rides': rides,
-                'casualties': casualties,
-                'injured': injured,
-                'killed': killed,
-                'casualty_rate_per_million': casualty_rate,
-                'injury_rate_per_million': injury_rate,
-                'fatality_rate_per_million': fatality_rate,
-                'is_projected': year == 2025
-            })
+    # Rate per million rides
+    rates['casualty_rate_per_million'] = (rates['casualties'] / rates['rides']) * 1000000
+    rates['injury_rate_per_million'] = (rates['injured'] / rates['rides']) * 1000000
+    rates['fatality_rate_per_million'] = (rates['killed'] / rates['rides']) * 1000000
+    rates['is_projected'] = rates.index == 2025
     
-    return casualty_rates
+    columns = ['year', 'rides', 'casualties', 'injured', 'killed', 'casualty_rate_per_million',
+               'injury_rate_per_million', 'fatality_rate_per_million', 'is_projected']
+    return rates.rename_axis('year').reset_index()[columns].to_dict('records')
 
 def create_casualty_rate_chart(casualty_rates):
     """Create casualty rate per ridership chart."""
@@ -145,12 +131,11 @@ def create_casualty_rate_chart(casualty_rates):
     
     bars = ax.bar(years, casualty_rates_values, color=colors, alpha=0.8, width=0.6)
     
-    # Add value labels (matching chart5/6 style)
-    for i, (year, rate, projected) in enumerate(zip(years, casualty_rates_values, df['is_projected'])):
-        if rate > max(casualty_rates_values) * 0.05:  # Only label if significant
-            label = f'{rate:.1f}{"*" if projected else ""}'
-            ax.text(year, rate + max(casualty_rates_values) * 0.02, label, 
-                   ha='center', va='bottom', fontweight='bold', fontsize=9)
+    # Add value labels (matching chart5/6 style), only where significant
+    show_label = casualty_rates_values > casualty_rates_values.max() * 0.05
+    labels = [f'{rate:.1f}{"*" if projected else ""}' if show else ''
+              for rate, projected, show in zip(casualty_rates_values, df['is_projected'], show_label)]
+    ax.bar_label(bars, labels=labels, padding=3, fontweight='bold', fontsize=9)
     
     ax.set_xlabel('Year')
     ax.set_ylabel('Casualties per Million Rides')
@@ -9,163 +9,224 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-from collections import defaultdict
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 from typing import Dict, List, Any, Tuple
 import os
 import sys
 
-def load_and_preprocess_data(filename: str) -> pd.DataFrame:
-    """Load CSV data and filter for pedestrian casualties."""
-    print("Loading collision data...")
+# Bytes of CSV parsed per streamed block (roughly 256k-1M collision rows)
+CSV_BLOCK_SIZE = 64 << 20
+
+# Canonical names for similar vehicle types, keyed by upper-cased name
+VEHICLE_MAPPING = {
+    'STATION WAGON/SPORT UTILITY VEHICLE': 'SUV/Station Wagon',
+    'SPORT UTILITY / STATION WAGON': 'SUV/Station Wagon',
+    'SEDAN': 'Sedan',
+    'PICK-UP TRUCK': 'Pickup Truck',
+    'BOX TRUCK': 'Box Truck',
+    'TAXI': 'Taxi',
+    'BUS': 'Bus',
+    'BIKE': 'Bicycle',
+    'E-BIKE': 'E-Bike',
+    'E-SCOOTER': 'E-Scooter',
+    'MOTORCYCLE': 'Motorcycle',
+    'TRACTOR TRUCK DIESEL': 'Tractor Truck',
+    'DUMP': 'Dump Truck',
+    'GARBAGE OR REFUSE': 'Garbage Truck',
+    'AMBULANCE': 'Ambulance',
+    'FIRE TRUCK': 'Fire Truck',
+    'VAN': 'Van',
+    'MOPED': 'Moped'
+}
+
+# Upper-cased vehicle names that carry no vehicle type
+BLANK_VEHICLE_NAMES = frozenset({'', 'UNKNOWN', 'NAN'})
+
+def parse_casualty_counts(counts: pa.Array, count_type: pa.DataType) -> pa.Array:
+    """Convert a casualty count column read as strings to integers, reading blank or non-numeric counts as 0."""
+    try:
+        counts = pc.cast(counts, count_type)
+    except pa.ArrowInvalid:
+        # Only blocks with cells such as "1.0" or "two" take the slower pandas coercion
+        numeric = pa.array(pd.to_numeric(counts.to_pandas(), errors='coerce'), from_pandas=True)
+        counts = pc.cast(numeric, count_type, safe=False)
+    return pc.fill_null(counts, 0)
+
+def parse_collision_csv(filename: str) -> pd.DataFrame:
+    """Stream the required CSV columns and keep the rows with pedestrian casualties."""
+    # Required columns
+    casualty_cols = ['NUMBER OF PEDESTRIANS INJURED', 'NUMBER OF PEDESTRIANS KILLED']
+    vehicle_cols = ['VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3',
+                   'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
+    required_columns = casualty_cols + vehicle_cols
     
-    # Check if file exists
-    if not os.path.exists(filename):
-        print(f"Error: File '{filename}' not found.")
+    # Check required columns exist (header only, before streaming any rows)
+    try:
+        header = pd.read_csv(filename, nrows=0)
+    except Exception as e:
+        print(f"Error reading CSV file: {e}")
         sys.exit(1)
     
+    missing_columns = [col for col in required_columns if col not in header.columns]
+    if missing_columns:
+        print(f"Error: Missing required columns: {missing_columns}")
+        sys.exit(1)
+    
+    # Stream the required columns in blocks with Arrow's multithreaded reader,
+    # keeping only the rows with pedestrian casualties from each block
+    column_types = {**{col: pa.string() for col in casualty_cols},
+                    **{col: pa.dictionary(pa.int32(), pa.string()) for col in vehicle_cols}}
+    convert_options = pacsv.ConvertOptions(include_columns=required_columns, column_types=column_types,
+                                           strings_can_be_null=True)
+    read_options = pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+    
+    total_records = 0
+    batches = []
     try:
-        df = pd.read_csv(filename, low_memory=False)
+        with pacsv.open_csv(filename, read_options=read_options, convert_options=convert_options) as reader:
+            for batch in reader:
+                total_records += batch.num_rows
+                
+                # Missing or non-numeric casualty counts are treated as zero
+                for col in casualty_cols:
+                    index = batch.schema.get_field_index(col)
+                    batch = batch.set_column(index, col, parse_casualty_counts(batch.column(index), pa.int16()))
+                
+                # Filter for collisions with pedestrian casualties; counts are non-negative,
+                # so a single compare on the bitwise OR finds any casualty
+                has_casualty = pc.greater(pc.bit_wise_or(batch.column(casualty_cols[0]),
+                                                         batch.column(casualty_cols[1])), 0)
+                batches.append(batch.filter(has_casualty))
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         sys.exit(1)
     
-    # Check required columns exist
-    required_columns = ['NUMBER OF PEDESTRIANS INJURED', 'NUMBER OF PEDESTRIANS KILLED',
-                       'VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3',
-                       'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
+    # The casualty columns were converted from strings in every batch
+    schema = reader.schema
+    for col in casualty_cols:
+        schema = schema.set(schema.get_field_index(col), pa.field(col, pa.int16()))
     
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        print(f"Error: Missing required columns: {missing_columns}")
+    # The filtered batches are only read once, so let Arrow release each column as it converts
+    table = pa.Table.from_batches(batches, schema=schema).unify_dictionaries()
+    del batches
+    pedestrian_collisions = table.to_pandas(self_destruct=True)
+    del table
+    # Kept in attrs so the record count survives the Parquet round trip
+    pedestrian_collisions.attrs['total_records'] = total_records
+    
+    return pedestrian_collisions
+
+def load_and_preprocess_data(filename: str) -> pd.DataFrame:
+    """Load CSV data and filter for pedestrian casualties."""
+    print("Loading collision data...")
+    
+    # Check if file exists
+    if not os.path.exists(filename):
+        print(f"Error: File '{filename}' not found.")
         sys.exit(1)
     
-    # Filter for collisions with pedestrian casualties
-    pedestrian_collisions = df[
-        (df['NUMBER OF PEDESTRIANS INJURED'] > 0) | 
-        (df['NUMBER OF PEDESTRIANS KILLED'] > 0)
-    ].copy()
+    # Reuse the filtered collisions from a previous run unless the CSV is newer
+    cache_file = os.path.splitext(filename)[0] + '.pedestrian_analysis.parquet'
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) > os.path.getmtime(filename):
+        print(f"Using cached collisions from '{cache_file}'")
+        pedestrian_collisions = pd.read_parquet(cache_file)
+    else:
+        pedestrian_collisions = parse_collision_csv(filename)
+        try:
+            pedestrian_collisions.to_parquet(cache_file, compression='zstd')
+        except Exception as e:
+            print(f"Warning: Could not write cache file '{cache_file}': {e}")
     
-    print(f"Total collision records: {len(df):,}")
+    print(f"Total collision records: {pedestrian_collisions.attrs['total_records']:,}")
     print(f"Collisions with pedestrian casualties: {len(pedestrian_collisions):,}")
     print(f"Total pedestrian injuries: {pedestrian_collisions['NUMBER OF PEDESTRIANS INJURED'].sum():,}")
     print(f"Total pedestrian deaths: {pedestrian_collisions['NUMBER OF PEDESTRIANS KILLED'].sum():,}")
     
     return pedestrian_collisions
 
-def extract_vehicle_types(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
-    """Extract and consolidate vehicle types from all vehicle columns."""
-    vehicle_casualties = defaultdict(lambda: {'injured': 0, 'killed': 0})
+def encode_vehicle_columns(df: pd.DataFrame, vehicle_cols: List[str]) -> pd.DataFrame:
+    """Clean vehicle names once per category and recode all columns onto one shared set of canonical names."""
+    stripped = [df[col].cat.categories.astype(str).str.strip() for col in vehicle_cols]
+    names = pd.Index(np.unique(np.concatenate([col_names.to_numpy() for col_names in stripped])))
+    
+    # Blank and unknown names are left out of the shared categories so they decode as missing
+    valid_names = names[~names.str.upper().isin(BLANK_VEHICLE_NAMES)]
     
+    # Similar names share one canonical category, keeping unmapped names as they are
+    clean_names = [VEHICLE_MAPPING.get(name.upper(), name) for name in valid_names]
+    categories, canonical = np.unique(clean_names, return_inverse=True)
+    
+    encoded = {}
+    for col, col_names in zip(vehicle_cols, stripped):
+        # Invalid names and missing values get code -1 through the appended sentinels
+        remap = np.append(np.append(canonical, -1)[valid_names.get_indexer(col_names)], -1)
+        encoded[col] = pd.Categorical.from_codes(remap[df[col].cat.codes.to_numpy()], categories=categories)
+    
+    return pd.DataFrame(encoded, index=df.index)
+
+def extract_vehicle_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Extract vehicle types from all vehicle columns and total casualties under their clean names."""
     # Vehicle type columns
     vehicle_cols = ['VEHICLE TYPE CODE 1', 'VEHICLE TYPE CODE 2', 'VEHICLE TYPE CODE 3', 
                    'VEHICLE TYPE CODE 4', 'VEHICLE TYPE CODE 5']
     
-    for _, row in df.iterrows():
-        # Safe conversion of casualty numbers
-        try:
-            injured = int(pd.to_numeric(row['NUMBER OF PEDESTRIANS INJURED'], errors='coerce') or 0)
-            killed = int(pd.to_numeric(row['NUMBER OF PEDESTRIANS KILLED'], errors='coerce') or 0)
-        except (ValueError, TypeError):
-            injured = killed = 0
-        
-        # Get all vehicle types involved in this collision
-        vehicles_in_collision = []
-        for col in vehicle_cols:
-            vehicle = row[col]
-            if pd.notna(vehicle) and str(vehicle).strip() and str(vehicle).strip().upper() not in ['', 'UNKNOWN', 'NAN']:
-                vehicles_in_collision.append(str(vehicle).strip())
-        
-        # If no valid vehicle types found, skip this collision
-        if not vehicles_in_collision:
-            continue
-            
-        # Distribute casualties among all vehicles in collision
-        casualty_per_vehicle_injured = injured / len(vehicles_in_collision)
-        casualty_per_vehicle_killed = killed / len(vehicles_in_collision)
-        
-        for vehicle in vehicles_in_collision:
-            vehicle_casualties[vehicle]['injured'] += casualty_per_vehicle_injured
-            vehicle_casualties[vehicle]['killed'] += casualty_per_vehicle_killed
-    
-    return vehicle_casualties
-
-def clean_vehicle_types(vehicle_casualties: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
-    """Clean and standardize vehicle type names."""
-    # Mapping for similar vehicle types
-    vehicle_mapping = {
-        'Station Wagon/Sport Utility Vehicle': 'SUV/Station Wagon',
-        'SPORT UTILITY / STATION WAGON': 'SUV/Station Wagon',
-        'Sedan': 'Sedan',
-        'SEDAN': 'Sedan',
-        'Pick-up Truck': 'Pickup Truck',
-        'PICK-UP TRUCK': 'Pickup Truck',
-        'Box Truck': 'Box Truck',
-        'BOX TRUCK': 'Box Truck',
-        'Taxi': 'Taxi',
-        'TAXI': 'Taxi',
-        'Bus': 'Bus',
-        'BUS': 'Bus',
-        'Bike': 'Bicycle',
-        'BIKE': 'Bicycle',
-        'E-Bike': 'E-Bike',
-        'E-BIKE': 'E-Bike',
-        'E-Scooter': 'E-Scooter',
-        'E-SCOOTER': 'E-Scooter',
-        'Motorcycle': 'Motorcycle',
-        'MOTORCYCLE': 'Motorcycle',
-        'Tractor Truck Diesel': 'Tractor Truck',
-        'TRACTOR TRUCK DIESEL': 'Tractor Truck',
-        'Dump': 'Dump Truck',
-        'DUMP': 'Dump Truck',
-        'Garbage or Refuse': 'Garbage Truck',
-        'GARBAGE OR REFUSE': 'Garbage Truck',
-        'Ambulance': 'Ambulance',
-        'AMBULANCE': 'Ambulance',
-        'Fire Truck': 'Fire Truck',
-        'FIRE TRUCK': 'Fire Truck',
-        'Van': 'Van',
-        'VAN': 'Van',
-        'Moped': 'Moped',
-        'MOPED': 'Moped'
-    }
-    
-    cleaned_casualties = defaultdict(lambda: {'injured': 0, 'killed': 0})
-    
-    for vehicle, casualties in vehicle_casualties.items():
-        # Clean the vehicle name
-        clean_name = vehicle_mapping.get(vehicle, vehicle)
-        cleaned_casualties[clean_name]['injured'] += casualties['injured']
-        cleaned_casualties[clean_name]['killed'] += casualties['killed']
-    
-    return dict(cleaned_casualties)
+    # Category codes of all vehicle slots as one (collisions, 5) array, -1 where missing or invalid
+    encoded = encode_vehicle_columns(df, vehicle_cols)
+    categories = encoded[vehicle_cols[0]].cat.categories
+    codes = np.stack([encoded[col].cat.codes.to_numpy() for col in vehicle_cols], axis=1)
+    present = codes >= 0
+    
+    # Distribute casualties among all vehicles in collision
+    # (casualty counts are already integers from load_and_preprocess_data)
+    vehicles_per_collision = present.sum(axis=1).clip(min=1)
+    injured_per_vehicle = df['NUMBER OF PEDESTRIANS INJURED'].to_numpy() / vehicles_per_collision
+    killed_per_vehicle = df['NUMBER OF PEDESTRIANS KILLED'].to_numpy() / vehicles_per_collision
+    
+    # One entry per valid vehicle involved in each collision
+    rows = np.nonzero(present)[0]
+    flat_codes = codes[present]
+    
+    # Accumulate into dense arrays indexed by category code
+    n = len(categories)
+    inj_acc = np.bincount(flat_codes, weights=injured_per_vehicle[rows], minlength=n)
+    kil_acc = np.bincount(flat_codes, weights=killed_per_vehicle[rows], minlength=n)
+    hits = np.bincount(flat_codes, minlength=n)
+    
+    seen = hits > 0
+    return pd.DataFrame({'injured': inj_acc[seen], 'killed': kil_acc[seen]},
+                        index=pd.Index(categories[seen], name='vehicle'))
 
-def create_visualizations(vehicle_data: Dict[str, Dict[str, float]]) -> pd.DataFrame:
+def create_visualizations(vehicle_data: pd.DataFrame) -> pd.DataFrame:
     """Create visualizations for pedestrian casualties by vehicle type."""
-    # Convert to DataFrame for easier plotting
-    data_for_plot = []
-    for vehicle, casualties in vehicle_data.items():
-        total = casualties['injured'] + casualties['killed']
-        if total >= 10:  # Only include vehicle types with significant casualties
-            data_for_plot.append({
-                'Vehicle Type': vehicle,
-                'Injured': casualties['injured'],
-                'Killed': casualties['killed'],
-                'Total': total,
-                'Fatality Rate': casualties['killed'] / total if total > 0 else 0.0
-            })
-    
-    df_plot = pd.DataFrame(data_for_plot).sort_values('Total', ascending=False)
+    # Only include vehicle types with significant casualties
+    totals = vehicle_data['injured'] + vehicle_data['killed']
+    significant = totals >= 10
+    df_plot = pd.DataFrame({
+        'Vehicle Type': vehicle_data.index[significant],
+        'Injured': vehicle_data['injured'].to_numpy()[significant],
+        'Killed': vehicle_data['killed'].to_numpy()[significant],
+        'Total': totals.to_numpy()[significant]
+    })
+    df_plot['Fatality Rate'] = df_plot['Killed'] / df_plot['Total']
+    df_plot = df_plot.sort_values('Total', ascending=False)
+    
+    # Slices shared by the panels, taken once from the sorted frame
+    top_15 = df_plot.head(15)
+    top_10 = top_15.head(10)
+    fatality_data = df_plot[df_plot['Total'] >= 50].head(10)  # Only vehicles with 50+ total casualties
+    others_total = df_plot['Total'].iloc[10:].sum()
     
     # Set up the plotting style
     plt.style.use('default')
     sns.set_palette("husl")
     
     # Create figure with subplots
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(20, 16))
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
     fig.suptitle('NYC Pedestrian Casualties by Vehicle Type', fontsize=20, fontweight='bold')
     
     # 1. Top vehicle types by total casualties
-    top_15 = df_plot.head(15)
     bars = ax1.barh(range(len(top_15)), top_15['Total'])
     ax1.set_yticks(range(len(top_15)))
     ax1.set_yticklabels(top_15['Vehicle Type'])
@@ -179,7 +240,6 @@ def create_visualizations(vehicle_data: Dict[str, Dict[str, float]]) -> pd.DataF
                 f'{int(value):,}', va='center', fontweight='bold')
     
     # 2. Injuries vs Deaths by vehicle type (top 10)
-    top_10 = df_plot.head(10)
     x_pos = np.arange(len(top_10))
     width = 0.35
     
@@ -207,7 +267,6 @@ def create_visualizations(vehicle_data: Dict[str, Dict[str, float]]) -> pd.DataF
                     f'{int(height):,}', ha='center', va='bottom', fontsize=8)
     
     # 3. Fatality rate by vehicle type (top 10)
-    fatality_data = df_plot[df_plot['Total'] >= 50].head(10)  # Only vehicles with 50+ total casualties
     bars3 = ax3.bar(range(len(fatality_data)), fatality_data['Fatality Rate'] * 100)
     ax3.set_xlabel('Vehicle Type')
     ax3.set_ylabel('Fatality Rate (%)')
@@ -221,11 +280,8 @@ def create_visualizations(vehicle_data: Dict[str, Dict[str, float]]) -> pd.DataF
                 f'{value*100:.1f}%', ha='center', va='bottom', fontweight='bold')
     
     # 4. Distribution pie chart (top 10 + others)
-    top_10_pie = df_plot.head(10)
-    others_total = df_plot.iloc[10:]['Total'].sum()
-    
-    pie_data = list(top_10_pie['Total']) + [others_total]
-    pie_labels = list(top_10_pie['Vehicle Type']) + ['Others']
+    pie_data = list(top_10['Total']) + [others_total]
+    pie_labels = list(top_10['Vehicle Type']) + ['Others']
     
     wedges, texts, autotexts = ax4.pie(pie_data, labels=pie_labels, autopct='%1.1f%%', startangle=90)
     ax4.set_title('Distribution of Pedestrian Casualties by Vehicle Type')
@@ -237,15 +293,15 @@ def create_visualizations(vehicle_data: Dict[str, Dict[str, float]]) -> pd.DataF
         autotext.set_fontsize(9)
     
     plt.tight_layout()
-    plt.savefig('pedestrian_casualties_by_vehicle_type.png', dpi=300, bbox_inches='tight')
+    plt.savefig('pedestrian_casualties_by_vehicle_type.png', dpi=150, bbox_inches='tight')
     print("\nVisualization saved as 'pedestrian_casualties_by_vehicle_type.png'")
     
     return df_plot
 
-def generate_report(vehicle_data: Dict[str, Dict[str, float]], df_plot: pd.DataFrame) -> None:
+def generate_report(vehicle_data: pd.DataFrame, df_plot: pd.DataFrame) -> None:
     """Generate a summary report with key insights."""
-    total_injured = sum(v['injured'] for v in vehicle_data.values())
-    total_killed = sum(v['killed'] for v in vehicle_data.values())
+    total_injured = vehicle_data['injured'].sum()
+    total_killed = vehicle_data['killed'].sum()
     
     print("\n" + "="*80)
     print("NYC PEDESTRIAN CASUALTY ANALYSIS BY VEHICLE TYPE")
@@ -293,11 +349,7 @@ def main() -> None:
     
     # Extract vehicle types and casualties
     print("\nExtracting vehicle types...")
-    vehicle_casualties = extract_vehicle_types(pedestrian_collisions)
-    
-    # Clean vehicle type names
-    print("Cleaning vehicle type names...")
-    cleaned_vehicle_data = clean_vehicle_types(vehicle_casualties)
+    cleaned_vehicle_data = extract_vehicle_types(pedestrian_collisions)
     
     # Create visualizations
     print("Creating visualizations...")
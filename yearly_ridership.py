@@ -8,24 +8,43 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime, date
+import os
+
+# Snapshot date of the bicycle counts export (Aug 24, 2025)
+SNAPSHOT_DAY_OF_YEAR = date(2025, 8, 24).timetuple().tm_yday
+DAYS_REMAINING = 365 - SNAPSHOT_DAY_OF_YEAR
+
+# Remaining months (Sep-Dec) typically have lower ridership, based on observed seasonal patterns
+SEASONAL_FACTOR = 0.85
 
 def load_and_process_yearly_data(csv_path):
     """Load bicycle count data and aggregate by year."""
     print("Loading bicycle count data...")
     
-    # Read the CSV
-    df = pd.read_csv(csv_path)
-    print(f"Loaded {len(df):,} records")
-    
-    # Convert date column to datetime
-    df['date'] = pd.to_datetime(df['date'])
+    # Reuse the parsed columns from a previous run unless the CSV is newer
+    cache_file = os.path.splitext(csv_path)[0] + '.yearly_ridership.parquet'
+    if os.path.exists(cache_file) and os.path.getmtime(cache_file) > os.path.getmtime(csv_path):
+        print(f"Using cached counts from '{cache_file}'")
+        df = pd.read_parquet(cache_file)
+    else:
+        # Read only the needed columns with Arrow's multithreaded reader, parsing the ISO timestamps while reading
+        df = pd.read_csv(csv_path, engine='pyarrow', usecols=['date', 'counts'], parse_dates=['date'],
+                         date_format='ISO8601', dtype={'counts': 'int32'})
+        
+        # Other export formats (e.g. "08/01/2012 12:00:00 AM") stay as strings; let pandas infer those
+        if not pd.api.types.is_datetime64_any_dtype(df['date']):
+            df['date'] = pd.to_datetime(df['date'], cache=True)
+        
+        # Only cache once the dates are parsed, so a bad read is never reused
+        try:
+            df.to_parquet(cache_file, compression='zstd')
+        except Exception as e:
+            print(f"Warning: Could not write cache file '{cache_file}': {e}")
     
-    # Extract year
-    df['year'] = df['date'].dt.year
+    print(f"Loaded {len(df):,} records")
     
     # Group by year and sum the counts
-    yearly_counts = df.groupby('year')['counts'].sum().reset_index()
-    yearly_counts = yearly_counts.sort_values('year')
+    yearly_counts = df.groupby(df['date'].dt.year.rename('year'), sort=True)['counts'].sum().reset_index()
     
     print(f"Data spans {yearly_counts['year'].min()} to {yearly_counts['year'].max()}")
     
@@ -37,39 +56,24 @@ def project_2025_ridership(yearly_counts):
     # Get 2025 data so far
     ridership_2025_ytd = yearly_counts[yearly_counts['year'] == 2025]['counts'].iloc[0]
     
-    # Calculate what day of year Aug 24 is (current date)
-    current_date = date(2025, 8, 24)
-    day_of_year = current_date.timetuple().tm_yday
-    days_remaining = 365 - day_of_year
+    # Day of year for Aug 24 (current date) and the days left after it
+    day_of_year = SNAPSHOT_DAY_OF_YEAR
+    days_remaining = DAYS_REMAINING
     
     # Calculate average daily rate for 2025 so far
     daily_rate_2025 = ridership_2025_ytd / day_of_year
     
     # Get trend from recent complete years (2022-2024)
-    recent_years = yearly_counts[yearly_counts['year'].isin([2022, 2023, 2024])]
-    if len(recent_years) >= 2:
+    recent_counts = yearly_counts.loc[yearly_counts['year'].isin([2022, 2023, 2024]), 'counts'].to_numpy(dtype=float)
+    if recent_counts.size >= 2:
         # Calculate year-over-year growth rate
-        growth_rates = []
-        for i in range(1, len(recent_years)):
-            prev_year = recent_years.iloc[i-1]['counts']
-            curr_year = recent_years.iloc[i]['counts']
-            growth_rate = (curr_year - prev_year) / prev_year
-            growth_rates.append(growth_rate)
-        
-        avg_growth_rate = np.mean(growth_rates)
+        avg_growth_rate = float((np.diff(recent_counts) / recent_counts[:-1]).mean())
     else:
         avg_growth_rate = 0  # fallback if not enough data
     
-    # Method 1: Simple projection based on daily rate
-    projection_simple = ridership_2025_ytd + (daily_rate_2025 * days_remaining)
-    
-    # Method 2: Trend-adjusted projection
-    # Apply seasonal adjustment - remaining months (Sep-Dec) typically have lower ridership
-    seasonal_factor = 0.85  # Based on observed seasonal patterns
-    projection_seasonal = ridership_2025_ytd + (daily_rate_2025 * days_remaining * seasonal_factor)
-    
-    # Use the seasonal-adjusted projection as our estimate
-    projection_2025 = projection_seasonal
+    # Seasonal-adjusted projection: the remaining days continue at the 2025 daily rate, scaled
+    # by the seasonal factor, i.e. ytd + (ytd / day_of_year) * days_remaining * seasonal_factor
+    projection_2025 = ridership_2025_ytd * (1.0 + days_remaining * SEASONAL_FACTOR / day_of_year)
     
     print(f"\n2025 Projection Analysis:")
     print(f"Current date: August 24, 2025 (Day {day_of_year} of 365)")